@@ -1,10 +1,92 @@
+import copy
+
 import numpy as np
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import streamlit as st
 import pandas as pd
 
+MONTHS = 24
+MONTH_LABELS = tuple(f"M{i+1}" for i in range(MONTHS))
+
 st.set_page_config(page_title="Real Estate ROI Dashboard", layout="wide")
 
+
+# --- Cached Precomputation ---
+@st.cache_data
+def _default_rates():
+    annual_rates = np.repeat(np.array([0.50, 0.40, 0.30, 0.25]), 6)
+    dollar_rates = np.fromiter((
+        39.0, 39.2, 39.5, 39.8, 40.1, 40.4,
+        40.6, 41.0, 41.3, 41.6, 42.0, 42.4,
+        42.8, 43.1, 43.5, 43.8, 44.1, 44.4,
+        44.7, 45.0, 45.2, 45.5, 45.7, 46.0
+    ), dtype=np.float64, count=MONTHS)
+    return annual_rates, dollar_rates
+
+
+@st.cache_data
+def _monthly_from_annual(annual_rates_tuple):
+    # Rates are piecewise-constant, so convert only the distinct values
+    unique_annual, inverse = np.unique(np.asarray(annual_rates_tuple), return_inverse=True)
+    unique_monthly = np.expm1(np.log1p(unique_annual) * (1.0 / 12.0))
+    return unique_monthly[inverse]
+
+
+# --- Cached Figure Skeletons ---
+@st.cache_resource
+def _build_dashboard_fig(labels):
+    f = make_subplots(
+        rows=2, cols=2,
+        shared_xaxes=True,
+        vertical_spacing=0.08,
+        subplot_titles=(
+            "Monthly Rent vs Interest Income (in TL)",
+            "Monthly Rent vs Interest Income (in USD)",
+            "Annual Interest Rate by Month",
+            "Expected Dollar Exchange Rate by Month"
+        )
+    )
+    f.add_trace(go.Bar(x=labels, name="Rent Income (TL)", marker_color="royalblue",
+                       legendgroup="tl", legendgrouptitle_text="TL"), row=1, col=1)
+    f.add_trace(go.Bar(x=labels, name="Interest Income (TL)", marker_color="orange",
+                       legendgroup="tl"), row=1, col=1)
+    f.add_trace(go.Bar(x=labels, name="Rent Income (USD)", marker_color="seagreen",
+                       legendgroup="usd", legendgrouptitle_text="USD"), row=1, col=2)
+    f.add_trace(go.Bar(x=labels, name="Interest Income (USD)", marker_color="tomato",
+                       legendgroup="usd"), row=1, col=2)
+    f.add_trace(go.Scatter(
+        x=labels,
+        line=dict(color="orange"),
+        name="Annual Interest Rate (%)",
+        legendgroup="rates",
+        legendgrouptitle_text="Scenario",
+        mode="lines+markers",
+        marker=dict(size=6)
+    ), row=2, col=1)
+    f.add_trace(go.Scatter(
+        x=labels,
+        line=dict(color="green"),
+        name="Dollar Rate (TL/USD)",
+        legendgroup="rates",
+        mode="lines+markers",
+        marker=dict(size=6)
+    ), row=2, col=2)
+    f.update_xaxes(title_text="Month", row=2)
+    f.update_yaxes(title_text="Income (TL)", row=1, col=1)
+    f.update_yaxes(title_text="Income (USD)", row=1, col=2)
+    f.update_yaxes(title_text="Interest Rate (%)", row=2, col=1)
+    f.update_yaxes(title_text="TL per USD", row=2, col=2)
+    f.update_layout(
+        barmode='group',
+        height=900,
+        legend=dict(groupclick="toggleitem", tracegroupgap=20),
+        margin=dict(t=30, b=30, l=10, r=10),
+        font=dict(size=12)
+    )
+    return f.to_dict()
+
+
 # --- Sidebar Inputs ---
 st.sidebar.header("Investment Assumptions")
 
@@ -12,21 +94,12 @@ initial_investment = st.sidebar.slider("Initial Investment (TL)", 1_000_000, 10_
 monthly_rent = st.sidebar.slider("Initial Monthly Rent (TL)", 5_000, 50_000, 20_000, step=1_000)
 rent_increase = st.sidebar.slider("Rent Increase Every 6 Months (%)", 0.0, 0.5, 0.15, step=0.01)
 
-months = 24
-month_labels = [f"M{i+1}" for i in range(months)]
-
 # --- Editable Inputs for Interest and FX ---
-default_annual_rates = [0.50]*6 + [0.40]*6 + [0.30]*6 + [0.25]*6
-default_dollar_rates = [
-    39.0, 39.2, 39.5, 39.8, 40.1, 40.4,
-    40.6, 41.0, 41.3, 41.6, 42.0, 42.4,
-    42.8, 43.1, 43.5, 43.8, 44.1, 44.4,
-    44.7, 45.0, 45.2, 45.5, 45.7, 46.0
-]
+default_annual_rates, default_dollar_rates = _default_rates()
 
 editable_df = pd.DataFrame({
-    "Month": month_labels,
-    "Annual Interest Rate (%)": [r * 100 for r in default_annual_rates],
+    "Month": MONTH_LABELS,
+    "Annual Interest Rate (%)": default_annual_rates * 100,
     "Dollar Rate (TL/USD)": default_dollar_rates
 })
 
@@ -40,65 +113,38 @@ edited_df = st.sidebar.data_editor(
 
 # Convert edited data to arrays
 annual_rates = np.array(edited_df["Annual Interest Rate (%)"]) / 100
-dollar_rates = np.array(edited_df["Dollar Rate (TL/USD)"])
+dollar_rates = np.array(edited_df["Dollar Rate (TL/USD)"], dtype=np.float64)
 
 
 # --- Rent Schedule ---
-rents = []
-current_rent = monthly_rent
-for i in range(months):
-    if i > 0 and i % 6 == 0:
-        current_rent *= (1 + rent_increase)
-    rents.append(current_rent)
-rents = np.array(rents)
+step = np.arange(MONTHS, dtype=np.int64) // 6
+rents = monthly_rent * np.power(1.0 + rent_increase, step)
 
 # --- Interest Income ---
-monthly_rates = (1 + annual_rates)**(1/12) - 1
+monthly_rates = _monthly_from_annual(tuple(annual_rates.tolist()))
 interest_income = initial_investment * monthly_rates
 
 # --- USD Conversion ---
-rents_usd = rents / dollar_rates
-interest_usd = interest_income / dollar_rates
+inv_dollar = np.reciprocal(dollar_rates)
+rents_usd = rents * inv_dollar
+interest_usd = interest_income * inv_dollar
 
 # --- Summary Stats ---
-avg_interest_annual = np.mean(annual_rates) * 100
-avg_dollar_rate = np.mean(dollar_rates)
-avg_monthly_rent = np.mean(rents)
-
-
-
-# --- Plot 1: TL View ---
-fig_tl = go.Figure()
-fig_tl.add_trace(go.Bar(x=month_labels, y=rents, name="Rent Income (TL)", marker_color="royalblue"))
-fig_tl.add_trace(go.Bar(x=month_labels, y=interest_income, name="Interest Income (TL)", marker_color="orange"))
-
-fig_tl.update_layout(
-    title="Monthly Rent vs Interest Income (in TL)",
-    xaxis_title="Month",
-    yaxis_title="Income (TL)",
-    barmode='group',
-    height=450,
-    margin=dict(t=30, b=30, l=10, r=10),
-    font=dict(size=12)
-)
-
-
-# --- Plot 2: USD View ---
-fig_usd = go.Figure()
-fig_usd.add_trace(go.Bar(x=month_labels, y=rents_usd, name="Rent Income (USD)", marker_color="seagreen"))
-fig_usd.add_trace(go.Bar(x=month_labels, y=interest_usd, name="Interest Income (USD)", marker_color="tomato"))
-
-
-
-fig_usd.update_layout(
-    title="Monthly Rent vs Interest Income (in USD)",
-    xaxis_title="Month",
-    yaxis_title="Income (USD)",
-    barmode='group',
-    height=450,
-    margin=dict(t=30, b=30, l=10, r=10),
-    font=dict(size=12)
-)
+inv_n = 1.0 / MONTHS
+avg_interest_annual = float(annual_rates.sum()) * inv_n * 100
+avg_dollar_rate = float(dollar_rates.sum()) * inv_n
+avg_monthly_rent = float(rents.sum()) * inv_n
+
+
+# --- Charts ---
+# The cached skeleton is shared by all sessions, so fill in a copy of it
+fig = copy.deepcopy(_build_dashboard_fig(MONTH_LABELS))
+fig["data"][0]["y"] = rents.astype(np.float32)
+fig["data"][1]["y"] = interest_income.astype(np.float32)
+fig["data"][2]["y"] = rents_usd.astype(np.float32)
+fig["data"][3]["y"] = interest_usd.astype(np.float32)
+fig["data"][4]["y"] = (annual_rates * 100).astype(np.float32)
+fig["data"][5]["y"] = dollar_rates.astype(np.float32)
 
 # --- Streamlit Layout ---
 st.title("🏘️ ROI Simulator")
@@ -113,53 +159,19 @@ st.markdown(f"""
 - Rent Increase Every 6 Months: `{int(rent_increase*100)}%`
 """)
 
-st.plotly_chart(fig_tl, use_container_width=True)
-st.plotly_chart(fig_usd, use_container_width=True)
+st.plotly_chart(fig, use_container_width=True)
 
 st.markdown("---")
 # Data table
 rates_df = pd.DataFrame({
-    "Month": month_labels,
-    "Annual Interest Rate": [f"{rate*100:.2f}%" for rate in annual_rates],
+    "Month": MONTH_LABELS,
+    "Annual Interest Rate": annual_rates,
     "Dollar Rate (TL/USD)": dollar_rates
 })
 
 st.markdown("---")
 st.subheader("📉 Scenario Inputs by Month")
-st.dataframe(rates_df.style.format(precision=2), use_container_width=True)
-
-# Interest Rate Trend
-fig_rate = go.Figure()
-fig_rate.add_trace(go.Scatter(
-    x=month_labels,
-    y=annual_rates * 100,
-    line=dict(color="orange"),
-    name="Annual Interest Rate (%)",
-    mode="lines+markers",
-    marker=dict(size=6)
-))
-fig_rate.update_layout(
-    title="Annual Interest Rate by Month",
-    xaxis_title="Month",
-    yaxis_title="Interest Rate (%)",
-    height=350
-)
-st.plotly_chart(fig_rate, use_container_width=True)
-
-# Dollar Rate Trend
-fig_fx = go.Figure()
-fig_fx.add_trace(go.Scatter(
-    x=month_labels,
-    y=dollar_rates,
-    line=dict(color="green"),
-    name="Dollar Rate (TL/USD)",
-    mode="lines+markers",
-    marker=dict(size=6)
-))
-fig_fx.update_layout(
-    title="Expected Dollar Exchange Rate by Month",
-    xaxis_title="Month",
-    yaxis_title="TL per USD",
-    height=350
+st.dataframe(
+    rates_df.style.format({"Annual Interest Rate": "{:.2%}", "Dollar Rate (TL/USD)": "{:.2f}"}),
+    use_container_width=True
 )
-st.plotly_chart(fig_fx, use_container_width=True)